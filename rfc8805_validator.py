@@ -7,14 +7,169 @@ Usage: python rfc8805_validator.py <filename_or_url>
 
 import sys
 import re
+import csv
+import io
+import string
+import array
 import ipaddress
-from typing import List, Tuple, Dict
+import operator
+from typing import List, Tuple, Dict, Optional
 import argparse
 import urllib.request
 import urllib.error
 import ssl
+import socket
+import struct
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 from dataclasses import dataclass
-from ipwhois import IPWhois
+from rirdata import lookup
+
+
+# Number of concurrent RDAP lookups for --show-rir
+RDAP_WORKERS = 16
+
+# Queued --show-rir prefixes are grouped by their covering aggregate of this
+# length; later prefixes of a group reuse the first lookup where it applies
+RIR_GROUP_PREFIXLEN = {4: 24, 6: 48}
+
+# Buffer size used when reading local files
+READ_BUFFER_SIZE = 1 << 20
+
+# Maximum number of errors and warnings kept for printing
+MAX_MESSAGES = 10_000
+
+# Error and warning codes, formatted via MESSAGES only when printed
+E_BAD_CSV = 'bad_csv'
+E_FIELD_COUNT = 'field_count'
+E_BAD_IPRANGE = 'bad_iprange'
+E_BAD_NETADDR = 'bad_netaddr'
+E_BAD_COUNTRY = 'bad_country'
+E_BAD_REGION = 'bad_region'
+E_BAD_CITY = 'bad_city'
+E_FULL_LINE = 'full_line'
+W_UNKNOWN_COUNTRY = 'unknown_country'
+W_SKIP_IPV6 = 'skip_ipv6'
+W_SKIP_IPV4 = 'skip_ipv4'
+W_OVERLAP = 'overlap'
+W_OVERLAP_LINE = 'overlap_line'
+
+MESSAGES = {
+    E_BAD_CSV: "Line {}: Malformed CSV: {}",
+    E_FIELD_COUNT: "Line {}: Expected at least 2 fields (IP range, country code), got {}",
+    E_BAD_IPRANGE: "Line {}: Invalid IP range {}: {}",
+    E_BAD_NETADDR: "Line {}: Invalid network address: {}",
+    E_BAD_COUNTRY: "Line {}: Invalid country code format: {}",
+    E_BAD_REGION: "Line {}: Invalid region code format: {}",
+    E_BAD_CITY: "Line {}: City name contains control characters: {}",
+    E_FULL_LINE: "  Full line: {}",
+    W_UNKNOWN_COUNTRY: "Line {}: Unknown country code: {}",
+    W_SKIP_IPV6: "Line {}: Skipping IPv6 address (IPv4 only mode): {}",
+    W_SKIP_IPV4: "Line {}: Skipping IPv4 address (IPv6 only mode): {}",
+    W_OVERLAP: "Warning: Overlapping IPv{} ranges found at lines {} and {}: {} overlaps {}",
+    W_OVERLAP_LINE: "  Line {}: {}",
+}
+
+# ISO 3166-1 alpha-2 country codes (common ones)
+VALID_COUNTRIES = frozenset({
+    'AD', 'AE', 'AF', 'AG', 'AI', 'AL', 'AM', 'AO', 'AQ', 'AR',
+    'AS', 'AT', 'AU', 'AW', 'AX', 'AZ', 'BA', 'BB', 'BD', 'BE',
+    'BF', 'BG', 'BH', 'BI', 'BJ', 'BL', 'BM', 'BN', 'BO', 'BQ',
+    'BR', 'BS', 'BT', 'BV', 'BW', 'BY', 'BZ', 'CA', 'CC', 'CD',
+    'CF', 'CG', 'CH', 'CI', 'CK', 'CL', 'CM', 'CN', 'CO', 'CR',
+    'CU', 'CV', 'CW', 'CX', 'CY', 'CZ', 'DE', 'DJ', 'DK', 'DM',
+    'DO', 'DZ', 'EC', 'EE', 'EG', 'EH', 'ER', 'ES', 'ET', 'FI',
+    'FJ', 'FK', 'FM', 'FO', 'FR', 'GA', 'GB', 'GD', 'GE', 'GF',
+    'GG', 'GH', 'GI', 'GL', 'GM', 'GN', 'GP', 'GQ', 'GR', 'GS',
+    'GT', 'GU', 'GW', 'GY', 'HK', 'HM', 'HN', 'HR', 'HT', 'HU',
+    'ID', 'IE', 'IL', 'IM', 'IN', 'IO', 'IQ', 'IR', 'IS', 'IT',
+    'JE', 'JM', 'JO', 'JP', 'KE', 'KG', 'KH', 'KI', 'KM', 'KN',
+    'KP', 'KR', 'KW', 'KY', 'KZ', 'LA', 'LB', 'LC', 'LI', 'LK',
+    'LR', 'LS', 'LT', 'LU', 'LV', 'LY', 'MA', 'MC', 'MD', 'ME',
+    'MF', 'MG', 'MH', 'MK', 'ML', 'MM', 'MN', 'MO', 'MP', 'MQ',
+    'MR', 'MS', 'MT', 'MU', 'MV', 'MW', 'MX', 'MY', 'MZ', 'NA',
+    'NC', 'NE', 'NF', 'NG', 'NI', 'NL', 'NO', 'NP', 'NR', 'NU',
+    'NZ', 'OM', 'PA', 'PE', 'PF', 'PG', 'PH', 'PK', 'PL', 'PM',
+    'PN', 'PR', 'PS', 'PT', 'PW', 'PY', 'QA', 'RE', 'RO', 'RS',
+    'RU', 'RW', 'SA', 'SB', 'SC', 'SD', 'SE', 'SG', 'SH', 'SI',
+    'SJ', 'SK', 'SL', 'SM', 'SN', 'SO', 'SR', 'SS', 'ST', 'SV',
+    'SX', 'SY', 'SZ', 'TC', 'TD', 'TF', 'TG', 'TH', 'TJ', 'TK',
+    'TL', 'TM', 'TN', 'TO', 'TR', 'TT', 'TV', 'TW', 'TZ', 'UA',
+    'UG', 'UM', 'US', 'UY', 'UZ', 'VA', 'VC', 'VE', 'VG', 'VI',
+    'VN', 'VU', 'WF', 'WS', 'YE', 'YT', 'ZA', 'ZM', 'ZW'
+})
+
+# Region code characters (ISO 3166-2 format: CC-SS where CC is country, SS is subdivision)
+_COUNTRY_CHARS = frozenset(string.ascii_uppercase)
+_SUBDIVISION_CHARS = frozenset(string.ascii_uppercase + string.digits)
+
+# Control characters not allowed in city names
+_CONTROL_CHARS = frozenset(map(chr, range(32)))
+
+# Fast path patterns for plain dotted-quad IPv4 and hex/colon IPv6 prefixes.
+# Leading zeros are excluded since inet_aton() would read them as octal.
+_IPV4_PREFIX_RE = re.compile(
+    r'((?:0|[1-9][0-9]{0,2})(?:\.(?:0|[1-9][0-9]{0,2})){3})(?:/(0|[1-9][0-9]?))?')
+_IPV6_PREFIX_RE = re.compile(r'([0-9A-Fa-f:]+)(?:/(0|[1-9][0-9]{0,2}))?')
+
+
+class HostBitsSetError(ValueError):
+    """Raised by parse_prefix() in strict mode when host bits are set."""
+
+
+def parse_prefix(ip_range: str, strict: bool = False) -> Tuple[int, int, int, int]:
+    """Parse an IP prefix in CIDR notation.
+
+    Returns (version, prefixlen, start, end) with integer start and end
+    addresses. Common forms are converted with inet_aton()/inet_pton();
+    anything else falls back to ipaddress, which raises ValueError for
+    invalid input. If strict is set, HostBitsSetError is raised when the
+    address has bits set beyond the prefix length.
+    """
+    match = _IPV4_PREFIX_RE.fullmatch(ip_range)
+    if match:
+        version, maxbits = 4, 32
+    else:
+        match = _IPV6_PREFIX_RE.fullmatch(ip_range)
+        version, maxbits = 6, 128
+    if match:
+        prefixlen = int(match.group(2)) if match.group(2) else maxbits
+        if prefixlen <= maxbits:
+            try:
+                if version == 4:
+                    addr = struct.unpack('>I', socket.inet_aton(match.group(1)))[0]
+                else:
+                    addr = int.from_bytes(socket.inet_pton(socket.AF_INET6, match.group(1)), 'big')
+            except OSError:
+                pass  # Let ipaddress produce the error message
+            else:
+                hostmask = (1 << (maxbits - prefixlen)) - 1
+                if strict and addr & hostmask:
+                    raise HostBitsSetError(f"{ip_range} has host bits set")
+                start = addr & ~hostmask
+                return version, prefixlen, start, start | hostmask
+
+    network = ipaddress.ip_network(ip_range, strict=False)
+    if strict and network.network_address != ipaddress.ip_interface(ip_range).ip:
+        raise HostBitsSetError(f"{ip_range} has host bits set")
+    return (network.version, network.prefixlen,
+            int(network.network_address), int(network.broadcast_address))
+
+
+def is_leaf_network_type(network_type: Optional[str]) -> bool:
+    """Return whether an RDAP network type denotes an end assignment.
+
+    Assignments (e.g. ARIN REASSIGNMENT, RIPE ASSIGNED PA, APNIC ASSIGNED
+    PORTABLE) are the leaves of the registry tree, unlike allocations.
+    """
+    return bool(network_type) and 'ASSIGN' in network_type.upper()
+
+
+@functools.lru_cache(maxsize=4096)
+def lookup_rdap(ip: str) -> Dict:
+    """Perform an RDAP lookup for an IP address, caching the result."""
+    return lookup(ip)
 
 
 @dataclass
@@ -33,40 +188,10 @@ class RFC8805Validator:
     """Validator for RFC 8805 formatted geo IP feed files."""
 
     def __init__(self):
-        # ISO 3166-1 alpha-2 country codes (common ones)
-        self.valid_countries = {
-            'AD', 'AE', 'AF', 'AG', 'AI', 'AL', 'AM', 'AO', 'AQ', 'AR',
-            'AS', 'AT', 'AU', 'AW', 'AX', 'AZ', 'BA', 'BB', 'BD', 'BE',
-            'BF', 'BG', 'BH', 'BI', 'BJ', 'BL', 'BM', 'BN', 'BO', 'BQ',
-            'BR', 'BS', 'BT', 'BV', 'BW', 'BY', 'BZ', 'CA', 'CC', 'CD',
-            'CF', 'CG', 'CH', 'CI', 'CK', 'CL', 'CM', 'CN', 'CO', 'CR',
-            'CU', 'CV', 'CW', 'CX', 'CY', 'CZ', 'DE', 'DJ', 'DK', 'DM',
-            'DO', 'DZ', 'EC', 'EE', 'EG', 'EH', 'ER', 'ES', 'ET', 'FI',
-            'FJ', 'FK', 'FM', 'FO', 'FR', 'GA', 'GB', 'GD', 'GE', 'GF',
-            'GG', 'GH', 'GI', 'GL', 'GM', 'GN', 'GP', 'GQ', 'GR', 'GS',
-            'GT', 'GU', 'GW', 'GY', 'HK', 'HM', 'HN', 'HR', 'HT', 'HU',
-            'ID', 'IE', 'IL', 'IM', 'IN', 'IO', 'IQ', 'IR', 'IS', 'IT',
-            'JE', 'JM', 'JO', 'JP', 'KE', 'KG', 'KH', 'KI', 'KM', 'KN',
-            'KP', 'KR', 'KW', 'KY', 'KZ', 'LA', 'LB', 'LC', 'LI', 'LK',
-            'LR', 'LS', 'LT', 'LU', 'LV', 'LY', 'MA', 'MC', 'MD', 'ME',
-            'MF', 'MG', 'MH', 'MK', 'ML', 'MM', 'MN', 'MO', 'MP', 'MQ',
-            'MR', 'MS', 'MT', 'MU', 'MV', 'MW', 'MX', 'MY', 'MZ', 'NA',
-            'NC', 'NE', 'NF', 'NG', 'NI', 'NL', 'NO', 'NP', 'NR', 'NU',
-            'NZ', 'OM', 'PA', 'PE', 'PF', 'PG', 'PH', 'PK', 'PL', 'PM',
-            'PN', 'PR', 'PS', 'PT', 'PW', 'PY', 'QA', 'RE', 'RO', 'RS',
-            'RU', 'RW', 'SA', 'SB', 'SC', 'SD', 'SE', 'SG', 'SH', 'SI',
-            'SJ', 'SK', 'SL', 'SM', 'SN', 'SO', 'SR', 'SS', 'ST', 'SV',
-            'SX', 'SY', 'SZ', 'TC', 'TD', 'TF', 'TG', 'TH', 'TJ', 'TK',
-            'TL', 'TM', 'TN', 'TO', 'TR', 'TT', 'TV', 'TW', 'TZ', 'UA',
-            'UG', 'UM', 'US', 'UY', 'UZ', 'VA', 'VC', 'VE', 'VG', 'VI',
-            'VN', 'VU', 'WF', 'WS', 'YE', 'YT', 'ZA', 'ZM', 'ZW'
-        }
-
-        # Common region code patterns (ISO 3166-2 format: CC-SS where CC is country, SS is subdivision)
-        self.region_pattern = re.compile(r'^[A-Z]{2}-[A-Z0-9]+$')
-
-        self.errors = []
-        self.warnings = []
+        self.errors = []  # List of (code, *args), at most MAX_MESSAGES
+        self.warnings = []  # List of (code, *args), at most MAX_MESSAGES
+        self.error_count = 0
+        self.warning_count = 0
         self.stats = {
             'total_lines': 0,
             'comment_lines': 0,
@@ -75,85 +200,110 @@ class RFC8805Validator:
             'invalid_lines': 0
         }
         # For --stats
-        self.prefix_lengths = {}  # {prefix_length: count}
+        self.prefix_lengths = Counter()  # {prefix_length: count}
         self.total_prefixes = 0
         self.total_addresses = 0  # Sum of all IP addresses in all prefixes
-        self.country_counts = {}  # {country_code: count}
+        self.country_counts = Counter()  # {country_code: count}
         self.distinct_countries = set()  # Set of unique country codes
+        self._country_slots = self._new_country_slots()  # Counts indexed by code letters
         # Separate IPv4/IPv6 tracking
-        self.ipv4_prefix_lengths = {}  # {prefix_length: count}
-        self.ipv6_prefix_lengths = {}  # {prefix_length: count}
+        self.ipv4_prefix_lengths = Counter()  # {prefix_length: count}
+        self.ipv6_prefix_lengths = Counter()  # {prefix_length: count}
         self.ipv4_total_prefixes = 0
         self.ipv6_total_prefixes = 0
         self.ipv4_total_addresses = 0
         self.ipv6_total_addresses = 0
+        # Prefix lengths seen per address family, tallied by tally_stats()
+        self._ipv4_prefixlens = []
+        self._ipv6_prefixlens = []
         # For overlap detection
-        self._all_networks = []  # List of (ip_network, line_num, line)
+        self._ipv4_ranges = []  # List of (start_int, end_int, line_num, line)
+        self._ipv6_ranges = []  # List of (start_int, end_int, line_num, line)
+        # For --show-rir
+        self._rir_queue = []  # List of (ip_range, entry) awaiting RDAP lookup
+
+    @staticmethod
+    def _record(messages: List, count: int, group: List) -> int:
+        """Store a group of related messages and return the updated count.
+
+        A group is kept whole or dropped whole, and once one group has been
+        dropped for exceeding MAX_MESSAGES no later group is stored either.
+        """
+        if count == len(messages) and count + len(group) <= MAX_MESSAGES:
+            messages.extend(group)
+        return count + len(group)
+
+    def add_error(self, code: str, *args, line: str = None):
+        """Record an error message code and its arguments.
+
+        If line is given, it is recorded with the error as its full line.
+        """
+        group = [(code,) + args]
+        if line:
+            group.append((E_FULL_LINE, line))
+        self.error_count = self._record(self.errors, self.error_count, group)
+
+    def add_warning(self, code: str, *args, lines: Tuple = ()):
+        """Record a warning message code and its arguments.
+
+        Each (line_num, line) pair in lines is recorded with the warning.
+        """
+        group = [(code,) + args]
+        group.extend((W_OVERLAP_LINE, line_num, line) for line_num, line in lines)
+        self.warning_count = self._record(self.warnings, self.warning_count, group)
+
+    def format_message(self, message: Tuple) -> str:
+        """Format a recorded (code, *args) error or warning."""
+        code, *args = message
+        if code == W_OVERLAP:
+            version, line1, line2, start1, end1, start2, end2 = args
+            args = (version, line1, line2,
+                    self._range_to_network(start1, end1, version),
+                    self._range_to_network(start2, end2, version))
+        return MESSAGES[code].format(*args)
 
     def validate_ip_range(self, ip_range: str, ipv4_only: bool = False,
-                         ipv6_only: bool = False, line_num: int = None, line: str = None) -> bool:
-        """Validate IP range in CIDR notation."""
+                         ipv6_only: bool = False, line_num: int = None,
+                         line: str = None) -> Optional[int]:
+        """Validate IP range in CIDR notation.
+
+        Returns the IP version of the range, or None if it is invalid.
+        """
         try:
-            network = ipaddress.ip_network(ip_range, strict=False)
+            version, prefixlen, start, end = parse_prefix(ip_range, strict=True)
 
-            # Check if it's a valid network
-            if network.network_address != network[0]:
-                self.errors.append(f"Line {line_num}: Invalid network address: {ip_range}")
-                if line:
-                    self.errors.append(f"  Full line: {line}")
-                return False
-
-            # For --stats: count prefix lengths (only if not filtered out)
-            if (not (ipv4_only and network.version != 4) and
-                not (ipv6_only and network.version != 6)):
-                prefixlen = network.prefixlen
-                self.prefix_lengths[prefixlen] = self.prefix_lengths.get(prefixlen, 0) + 1
-                self.total_prefixes += 1
-                # Calculate total addresses in this prefix
-                self.total_addresses += network.num_addresses
-
-                # Separate IPv4/IPv6 tracking
-                if network.version == 4:
-                    self.ipv4_prefix_lengths[prefixlen] = (
-                        self.ipv4_prefix_lengths.get(prefixlen, 0) + 1
-                    )
-                    self.ipv4_total_prefixes += 1
-                    self.ipv4_total_addresses += network.num_addresses
-                else:  # IPv6
-                    self.ipv6_prefix_lengths[prefixlen] = (
-                        self.ipv6_prefix_lengths.get(prefixlen, 0) + 1
-                    )
-                    self.ipv6_total_prefixes += 1
-                    self.ipv6_total_addresses += network.num_addresses
-
-            # For overlap detection, store all valid networks
+            # For --stats: record prefix lengths (only if not filtered out)
+            if version == 4:
+                if not ipv6_only:
+                    self._ipv4_prefixlens.append(prefixlen)
+            elif not ipv4_only:
+                self._ipv6_prefixlens.append(prefixlen)
+
+            # For overlap detection, store integer endpoints of all valid networks
             if line_num is not None and line is not None:
-                self._all_networks.append((network, line_num, line))
+                ranges = self._ipv4_ranges if version == 4 else self._ipv6_ranges
+                ranges.append((start, end, line_num, line))
 
-            return True
+            return version
+        except HostBitsSetError:
+            self.add_error(E_BAD_NETADDR, line_num, ip_range, line=line)
+            return None
         except ValueError as e:
-            self.errors.append(f"Line {line_num}: Invalid IP range {ip_range}: {e}")
-            if line:
-                self.errors.append(f"  Full line: {line}")
-            return False
+            self.add_error(E_BAD_IPRANGE, line_num, ip_range, str(e), line=line)
+            return None
 
     def validate_country_code(self, country_code: str, line_num: int = None, line: str = None) -> bool:
         """Validate country code (ISO 3166-1 alpha-2)."""
         if not country_code or len(country_code) != 2:
-            self.errors.append(f"Line {line_num}: Invalid country code format: {country_code}")
-            if line:
-                self.errors.append(f"  Full line: {line}")
+            self.add_error(E_BAD_COUNTRY, line_num, country_code, line=line)
             return False
 
-        if country_code not in self.valid_countries:
-            self.warnings.append(f"Line {line_num}: Unknown country code: {country_code}")
+        if country_code not in VALID_COUNTRIES:
+            self.add_warning(W_UNKNOWN_COUNTRY, line_num, country_code)
             return False
 
         # For --stats: track country statistics
-        self.country_counts[country_code] = (
-            self.country_counts.get(country_code, 0) + 1
-        )
-        self.distinct_countries.add(country_code)
+        self._country_slots[(ord(country_code[0]) - 65) * 26 + ord(country_code[1]) - 65] += 1
 
         return True
 
@@ -162,10 +312,11 @@ class RFC8805Validator:
         if not region_code:
             return True  # Region codes can be empty according to RFC
 
-        if not self.region_pattern.match(region_code):
-            self.errors.append(f"Line {line_num}: Invalid region code format: {region_code}")
-            if line:
-                self.errors.append(f"  Full line: {line}")
+        if (len(region_code) < 4 or region_code[2] != '-' or
+                region_code[0] not in _COUNTRY_CHARS or
+                region_code[1] not in _COUNTRY_CHARS or
+                not _SUBDIVISION_CHARS.issuperset(region_code[3:])):
+            self.add_error(E_BAD_REGION, line_num, region_code, line=line)
             return False
 
         return True
@@ -176,24 +327,74 @@ class RFC8805Validator:
             return True  # City names can be empty according to RFC
 
         # Basic validation - should not contain control characters
-        if any(ord(c) < 32 for c in city_name):
-            self.errors.append(f"Line {line_num}: City name contains control characters: {city_name}")
-            if line:
-                self.errors.append(f"  Full line: {line}")
+        if not _CONTROL_CHARS.isdisjoint(city_name):
+            self.add_error(E_BAD_CITY, line_num, city_name, line=line)
             return False
 
         return True
 
-    def get_rir_data(self, ip_range: str) -> Dict:
-        """Get RIR data for a given IP range."""
+    @staticmethod
+    def _find_cached_rdap(network, cache: Dict) -> Optional[Dict]:
+        """Return a cached RDAP result for a block covering network, if any.
+
+        The cache maps (version, prefixlen, start >> host_bits) to results.
+        """
+        start = int(network.network_address)
+        for plen in range(network.prefixlen, -1, -1):
+            key = (network.version, plen, start >> (network.max_prefixlen - plen))
+            result = cache.get(key)
+            if result is not None:
+                return result
+        return None
+
+    @staticmethod
+    def _cache_rdap(network, result: Dict, cache: Dict):
+        """Cache an RDAP result for prefixes inside the same leaf assignment."""
+        network_info = result.get('network') or {}
+        if not is_leaf_network_type(network_info.get('type')):
+            return
+
+        try:
+            asn_network = ipaddress.ip_network(result.get('asn_cidr'), strict=False)
+            net_cidrs = network_info.get('cidr') or ''
+            reg_networks = [ipaddress.ip_network(cidr.strip(), strict=False)
+                            for cidr in net_cidrs.split(',') if cidr.strip()]
+        except (ValueError, TypeError):
+            return  # No usable CIDR information, don't cache
+
+        if asn_network.version != network.version or not network.subnet_of(asn_network):
+            return
+        for reg_network in reg_networks:
+            if reg_network.version == network.version and network.subnet_of(reg_network):
+                break
+        else:
+            return
+
+        if asn_network.subnet_of(reg_network):
+            block = asn_network
+        elif reg_network.subnet_of(asn_network):
+            block = reg_network
+        else:
+            return
+        key = (block.version, block.prefixlen,
+               int(block.network_address) >> (block.max_prefixlen - block.prefixlen))
+        cache[key] = result
+
+    def get_rir_data(self, ip_range: str, cache: Optional[Dict] = None) -> Dict:
+        """Get RIR data for a given IP range.
+
+        If a cache dict is given, RDAP results stored in it by earlier calls
+        are reused where they apply, and new results are added to it.
+        """
         try:
             # Extract the first IP address from the range for whois lookup
             network = ipaddress.ip_network(ip_range, strict=False)
-            first_ip = str(network.network_address)
-            
-            obj = IPWhois(first_ip)
-            result = obj.lookup_rdap()
-            
+            result = None if cache is None else self._find_cached_rdap(network, cache)
+            if result is None:
+                result = lookup_rdap(str(network.network_address))
+                if cache is not None:
+                    self._cache_rdap(network, result, cache)
+
             # Extract the required fields
             asn = result.get('asn', 'N/A')
             asn_cidr = result.get('asn_cidr', 'N/A')
@@ -247,70 +448,152 @@ class RFC8805Validator:
                 'network_country': 'Error'
             }
 
-    def validate_entry(self, line: str, line_num: int, config: Config) -> bool:
-        """Validate a single data line."""
-        # Remove trailing comma and split
-        line = line.rstrip(',')
-        fields = line.split(',')
+    def _get_rir_data_after(self, ip_range: str, first, cache: Dict) -> Dict:
+        """Get RIR data once the first lookup of the same group has finished."""
+        first.result()
+        return self.get_rir_data(ip_range, dict(cache))
+
+    def print_rir_data(self):
+        """Look up and print RIR data for all queued entries.
 
+        Lookups run concurrently in a thread pool so that RDAP round-trips
+        overlap. The first entry of each group (see RIR_GROUP_PREFIXLEN) is
+        submitted first; the others only read a copy of its cache, so which
+        lookups are reused does not depend on thread scheduling. Results are
+        printed in file order as they become available.
+        """
+        queue = self._rir_queue
+        firsts = {}  # {aggregate: (future, cache)} for the first entry of each group
+        futures = []
+        later = []  # (index, ip_range, aggregate) of the other entries
+        executor = ThreadPoolExecutor(max_workers=RDAP_WORKERS)
+        try:
+            for index, (ip_range, _) in enumerate(queue):
+                version, _, start, _ = parse_prefix(ip_range)
+                aggregate = (version, start >> ((32 if version == 4 else 128) -
+                                                RIR_GROUP_PREFIXLEN[version]))
+                if aggregate in firsts:
+                    later.append((index, ip_range, aggregate))
+                    futures.append(None)
+                else:
+                    cache = {}
+                    future = executor.submit(self.get_rir_data, ip_range, cache)
+                    firsts[aggregate] = (future, cache)
+                    futures.append(future)
+            # Submitted after every first entry, so their waits cannot deadlock
+            for index, ip_range, aggregate in later:
+                futures[index] = executor.submit(self._get_rir_data_after, ip_range,
+                                                 *firsts[aggregate])
+
+            for (_, entry), future in zip(queue, futures):
+                rir_data = future.result()
+                print(entry)
+                print(f"    asn: {rir_data['asn']}")
+                print(f"    asn_cidr: {rir_data['asn_cidr']}")
+                print(f"    asn_country_code: {rir_data['asn_country_code']}")
+                print(f"    asn_registry: {rir_data['asn_registry']}")
+                print(f"    network->cidr: {rir_data['network_cidr']}")
+                print(f"    network->handle: {rir_data['network_handle']}")
+                print(f"    network->name: {rir_data['network_name']}")
+                print(f"    network->parent_handle: {rir_data['network_parent_handle']}")
+                print(f"    network->type: {rir_data['network_type']}")
+                print(f"    network->country: {rir_data['network_country']}")
+        except KeyboardInterrupt:
+            # Don't wait for the remaining lookups when interrupted
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        self._rir_queue = []
+
+    def validate_entry(self, fields: List[str], line_num: int, line: str,
+                       config: Config) -> bool:
+        """Validate the fields of a single data line."""
         if len(fields) < 2:
-            self.errors.append(f"Line {line_num}: Expected at least 2 fields (IP range, country code), got {len(fields)}")
-            self.errors.append(f"  Full line: {line}")
+            self.add_error(E_FIELD_COUNT, line_num, len(fields), line=line)
             return False
 
         # Extract fields, handling optional region, city, and postal code
-        ip_range = fields[0]
-        country_code = fields[1]
-        region_code = fields[2] if len(fields) > 2 else ""
-        city_name = fields[3] if len(fields) > 3 else ""
         # Note: postal code (field 5) is also optional but not currently validated
+        ip_range, country_code, region_code, city_name = map(str.strip, (fields + ['', ''])[:4])
 
         # Validate each field
-        ip_valid = self.validate_ip_range(ip_range.strip(), config.ipv4_only, config.ipv6_only, line_num, line)
-        country_valid = self.validate_country_code(country_code.strip(), line_num, line)
-        region_valid = self.validate_region_code(region_code.strip(), line_num, line)
-        city_valid = self.validate_city_name(city_name.strip(), line_num, line)
-
-        # Show RIR data if requested
+        version = self.validate_ip_range(ip_range, config.ipv4_only, config.ipv6_only,
+                                         line_num, line)
+        ip_valid = version is not None
+        country_valid = self.validate_country_code(country_code, line_num, line)
+        region_valid = self.validate_region_code(region_code, line_num, line)
+        city_valid = self.validate_city_name(city_name, line_num, line)
+
+        # Queue RIR data lookup if requested (printed after the file is read)
         if config.show_rir and ip_valid:
-            print(f"{ip_range.strip()},{country_code.strip()},{region_code.strip()},{city_name.strip()}")
-            rir_data = self.get_rir_data(ip_range.strip())
-            print(f"    asn: {rir_data['asn']}")
-            print(f"    asn_cidr: {rir_data['asn_cidr']}")
-            print(f"    asn_country_code: {rir_data['asn_country_code']}")
-            print(f"    asn_registry: {rir_data['asn_registry']}")
-            print(f"    network->cidr: {rir_data['network_cidr']}")
-            print(f"    network->handle: {rir_data['network_handle']}")
-            print(f"    network->name: {rir_data['network_name']}")
-            print(f"    network->parent_handle: {rir_data['network_parent_handle']}")
-            print(f"    network->type: {rir_data['network_type']}")
-            print(f"    network->country: {rir_data['network_country']}")
+            self._rir_queue.append((
+                ip_range,
+                f"{ip_range},{country_code},{region_code},{city_name}"
+            ))
 
         # Filter by address family if requested
-        if config.ipv4_only or config.ipv6_only:
-            try:
-                network = ipaddress.ip_network(ip_range.strip(), strict=False)
-                if config.ipv4_only and network.version != 4:
-                    self.warnings.append(
-                        f"Line {line_num}: Skipping IPv6 address (IPv4 only mode): "
-                        f"{ip_range.strip()}"
-                    )
-                    return False
-                if config.ipv6_only and network.version != 6:
-                    self.warnings.append(
-                        f"Line {line_num}: Skipping IPv4 address (IPv6 only mode): "
-                        f"{ip_range.strip()}"
-                    )
-                    return False
-            except ValueError:
-                pass  # Let the normal validation handle invalid IPs
-
-        return all([ip_valid, country_valid, region_valid, city_valid])
+        if config.ipv4_only and version == 6:
+            self.add_warning(W_SKIP_IPV6, line_num, ip_range)
+            return False
+        if config.ipv6_only and version == 4:
+            self.add_warning(W_SKIP_IPV4, line_num, ip_range)
+            return False
+
+        return ip_valid and country_valid and region_valid and city_valid
+
+    def _data_lines(self, file_obj):
+        """Yield (line_num, line) for data lines, skipping empty and comment lines.
+
+        Trailing commas are removed from the yielded lines.
+        """
+        stats = self.stats
+        for line_num, line in enumerate(file_obj, 1):
+            stats['total_lines'] += 1
+            line = line.strip()
+
+            # Skip empty lines
+            if not line:
+                continue
+
+            # Handle comments
+            if line.startswith('#'):
+                stats['comment_lines'] += 1
+                continue
+
+            yield line_num, line.rstrip(',')
+
+    def _validate_lines(self, file_obj, config: Config):
+        """Validate all data lines read from a file object."""
+        # Validate data lines, with loop invariants bound to locals
+        stats = self.stats
+        validate_entry = self.validate_entry
+        for line_num, line in self._data_lines(file_obj):
+            stats['data_lines'] += 1
+
+            # Only lines with quotes need the CSV parser; each is parsed
+            # on its own, so a stray quote cannot span physical lines
+            if '"' not in line:
+                fields = line.split(',')
+            else:
+                try:
+                    fields = next(csv.reader((line,), strict=True))
+                except csv.Error as e:
+                    self.add_error(E_BAD_CSV, line_num, str(e), line=line)
+                    stats['invalid_lines'] += 1
+                    continue
+
+            if validate_entry(fields, line_num, line, config):
+                stats['valid_lines'] += 1
+            else:
+                stats['invalid_lines'] += 1
 
     def validate_file(self, filename: str, config: Config) -> bool:
         """Validate entire file according to RFC 8805."""
         self.errors = []
         self.warnings = []
+        self.error_count = 0
+        self.warning_count = 0
+        self._rir_queue = []
         self.stats = {
             'total_lines': 0,
             'comment_lines': 0,
@@ -321,18 +604,11 @@ class RFC8805Validator:
 
         # Reset statistics if filtering is applied
         if config.ipv4_only or config.ipv6_only:
-            self.prefix_lengths = {}
-            self.total_prefixes = 0
-            self.total_addresses = 0
-            self.country_counts = {}
-            self.distinct_countries = set()
-            self.ipv4_prefix_lengths = {}
-            self.ipv6_prefix_lengths = {}
-            self.ipv4_total_prefixes = 0
-            self.ipv6_total_prefixes = 0
-            self.ipv4_total_addresses = 0
-            self.ipv6_total_addresses = 0
-            self._all_networks = [] # Clear overlap detection list
+            self._country_slots = self._new_country_slots()
+            self._ipv4_prefixlens = []  # Prefix totals are recomputed from these
+            self._ipv6_prefixlens = []
+            self._ipv4_ranges = []  # Clear overlap detection lists
+            self._ipv6_ranges = []
 
         try:
             # Get the appropriate file-like object
@@ -345,38 +621,13 @@ class RFC8805Validator:
                 else:
                     context = None
 
-                file_obj = urllib.request.urlopen(filename, context=context)
-                decode_lines = True
+                with urllib.request.urlopen(filename, context=context) as response:
+                    with io.TextIOWrapper(response, encoding='utf-8', newline='') as file_obj:
+                        self._validate_lines(file_obj, config)
             else:
-                file_obj = open(filename, 'r', encoding='utf-8')
-                decode_lines = False
-
-            # Process lines from either source
-            with file_obj:
-                for line_num, line in enumerate(file_obj, 1):
-                    self.stats['total_lines'] += 1
-
-                    # Decode if needed (for URL responses)
-                    if decode_lines:
-                        line = line.decode('utf-8').strip()
-                    else:
-                        line = line.strip()
-
-                    # Skip empty lines
-                    if not line:
-                        continue
-
-                    # Handle comments
-                    if line.startswith('#'):
-                        self.stats['comment_lines'] += 1
-                        continue
-
-                    # Validate data line
-                    self.stats['data_lines'] += 1
-                    if self.validate_entry(line, line_num, config):
-                        self.stats['valid_lines'] += 1
-                    else:
-                        self.stats['invalid_lines'] += 1
+                with open(filename, 'r', encoding='utf-8', newline='',
+                          buffering=READ_BUFFER_SIZE) as file_obj:
+                    self._validate_lines(file_obj, config)
 
         except urllib.error.URLError as e:
             print(f"Error accessing URL: {e}")
@@ -386,43 +637,95 @@ class RFC8805Validator:
             return False
         except Exception as e:
             print(f"Error reading file: {e}")
+            # Show RIR data for the entries read before the error
+            if self._rir_queue:
+                self.print_rir_data()
             return False
+        finally:
+            self.tally_stats()
+
+        # Show RIR data if requested
+        if self._rir_queue:
+            self.print_rir_data()
 
         # Check for overlapping IP ranges (separate by IP version)
-        if self._all_networks and not config.no_overlap_check:
-            # Separate IPv4 and IPv6 networks
-            ipv4_networks = [(net, line, _) for net, line, _ in self._all_networks if net.version == 4]
-            ipv6_networks = [(net, line, _) for net, line, _ in self._all_networks if net.version == 6]
-
-            # Check IPv4 overlaps
-            if ipv4_networks:
-                sorted_ipv4 = sorted(ipv4_networks, key=lambda x: x[0])
-                for i in range(len(sorted_ipv4) - 1):
-                    current_net, current_line, current_line_str = sorted_ipv4[i]
-                    next_net, next_line, next_line_str = sorted_ipv4[i + 1]
-                    if current_net.overlaps(next_net):
-                        self.warnings.append(
-                            f"Warning: Overlapping IPv4 ranges found at lines {current_line} and {next_line}: "
-                            f"{current_net} overlaps {next_net}"
-                        )
-                        self.warnings.append(f"  Line {current_line}: {current_line_str}")
-                        self.warnings.append(f"  Line {next_line}: {next_line_str}")
-
-            # Check IPv6 overlaps
-            if ipv6_networks:
-                sorted_ipv6 = sorted(ipv6_networks, key=lambda x: x[0])
-                for i in range(len(sorted_ipv6) - 1):
-                    current_net, current_line, current_line_str = sorted_ipv6[i]
-                    next_net, next_line, next_line_str = sorted_ipv6[i + 1]
-                    if current_net.overlaps(next_net):
-                        self.warnings.append(
-                            f"Warning: Overlapping IPv6 ranges found at lines {current_line} and {next_line}: "
-                            f"{current_net} overlaps {next_net}"
-                        )
-                        self.warnings.append(f"  Line {current_line}: {current_line_str}")
-                        self.warnings.append(f"  Line {next_line}: {next_line_str}")
-
-        return len(self.errors) == 0
+        if not config.no_overlap_check:
+            self.check_overlaps(self._ipv4_ranges, 4)
+            self.check_overlaps(self._ipv6_ranges, 6)
+
+        return self.error_count == 0
+
+    @staticmethod
+    def _range_to_network(start: int, end: int, version: int):
+        """Rebuild an ip_network object from integer endpoints."""
+        if version == 4:
+            return ipaddress.IPv4Network((start, 32 - (end - start).bit_length()))
+        return ipaddress.IPv6Network((start, 128 - (end - start).bit_length()))
+
+    def check_overlaps(self, ranges: List[Tuple], version: int):
+        """Check a list of (start, end, line_num, line) ranges for overlaps.
+
+        CIDR prefixes are either nested or disjoint, so after sorting by start
+        address (larger prefixes first on ties) the prefixes enclosing the
+        current one form a stack. Every prefix still on the stack overlaps the
+        current one, which reports all overlapping pairs, including a large
+        prefix containing several smaller non-adjacent ones. The sort is close
+        to linear for feeds that are already mostly in address order.
+        """
+        if not ranges:
+            return
+
+        # Two stable sorts on plain integer keys are cheaper than one sort on a
+        # compound (start, -end) key; IPv6 ints compare in C just like IPv4 ones.
+        ranges.sort(key=operator.itemgetter(1), reverse=True)
+        ranges.sort(key=operator.itemgetter(0))
+        add_warning = self.add_warning
+        enclosing = []
+        for current in ranges:
+            start = current[0]
+            while enclosing and enclosing[-1][1] < start:
+                enclosing.pop()
+            if enclosing and enclosing[-1][0] == start and enclosing[-1][1] == current[1]:
+                # Duplicate prefix: report it against its first copy only, which
+                # keeps the stack no deeper than the number of prefix lengths
+                overlapping = enclosing[-1:]
+            else:
+                overlapping = enclosing
+            for outer in overlapping:
+                add_warning(W_OVERLAP, version, outer[2], current[2],
+                            outer[0], outer[1], start, current[1],
+                            lines=((outer[2], outer[3]), (current[2], current[3])))
+            if overlapping is enclosing:
+                enclosing.append(current)
+
+    @staticmethod
+    def _new_country_slots():
+        """Return zeroed counters for all 26 * 26 two-letter country codes."""
+        return array.array('I', bytes(4 * 26 * 26))
+
+    def tally_stats(self):
+        """Compute prefix, address and country statistics from recorded data.
+
+        Prefix lengths are counted in one pass per address family, and address
+        totals are derived from the per-length counts. Country counts are
+        decoded from the nonzero slots of the per-code counter array.
+        """
+        self.country_counts = Counter({
+            chr(index // 26 + 65) + chr(index % 26 + 65): count
+            for index, count in enumerate(self._country_slots) if count
+        })
+        self.distinct_countries = set(self.country_counts)
+        self.ipv4_prefix_lengths = Counter(self._ipv4_prefixlens)
+        self.ipv6_prefix_lengths = Counter(self._ipv6_prefixlens)
+        self.ipv4_total_prefixes = len(self._ipv4_prefixlens)
+        self.ipv6_total_prefixes = len(self._ipv6_prefixlens)
+        self.ipv4_total_addresses = sum(
+            count << (32 - plen) for plen, count in self.ipv4_prefix_lengths.items())
+        self.ipv6_total_addresses = sum(
+            count << (128 - plen) for plen, count in self.ipv6_prefix_lengths.items())
+        self.prefix_lengths = self.ipv4_prefix_lengths + self.ipv6_prefix_lengths
+        self.total_prefixes = self.ipv4_total_prefixes + self.ipv6_total_prefixes
+        self.total_addresses = self.ipv4_total_addresses + self.ipv6_total_addresses
 
     def print_results(self):
         """Print validation results."""
@@ -434,18 +737,22 @@ class RFC8805Validator:
         print(f"Invalid lines: {self.stats['invalid_lines']}")
 
         if self.warnings:
-            print(f"\n=== Warnings ({len(self.warnings)}) ===")
+            print(f"\n=== Warnings ({self.warning_count}) ===")
             for warning in self.warnings:
-                print(f"  WARNING: {warning}")
+                print(f"  WARNING: {self.format_message(warning)}")
+            if self.warning_count > len(self.warnings):
+                print(f"  ... {self.warning_count - len(self.warnings)} more warnings not shown")
 
         if self.errors:
-            print(f"\n=== Errors ({len(self.errors)}) ===")
+            print(f"\n=== Errors ({self.error_count}) ===")
             for error in self.errors:
-                if error.startswith("  Full line:"):
-                    print(f"  {error}")
+                if error[0] == E_FULL_LINE:
+                    print(f"  {self.format_message(error)}")
                 else:
-                    print(f"  ERROR: {error}")
-            print(f"\n❌ Validation FAILED with {len(self.errors)} errors")
+                    print(f"  ERROR: {self.format_message(error)}")
+            if self.error_count > len(self.errors):
+                print(f"  ... {self.error_count - len(self.errors)} more errors not shown")
+            print(f"\n❌ Validation FAILED with {self.error_count} errors")
         else:
             print(f"\n✅ Validation PASSED - All {self.stats['valid_lines']} data lines are valid")
 
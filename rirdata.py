@@ -1,19 +1,24 @@
 #!/usr/bin/env python3
 """
 Print RIR data for a given IP prefix.
+
+The lookup() function can also be imported to perform RDAP lookups.
 """
 
 import sys
-import json
 from ipwhois import IPWhois
 
 
+def lookup(ip):
+    """Return the RDAP lookup result for an IP address."""
+    return IPWhois(ip).lookup_rdap()
+
+
 def main():
     """Main function."""
 
     ip = sys.argv[1]
-    obj = IPWhois(ip)
-    result = obj.lookup_rdap()
+    result = lookup(ip)
 
     print(ip)
     print("asn:", result['asn'])